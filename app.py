@@ -1,18 +1,48 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 import xgboost as xgb
 import numpy as np
+from numba import njit
 from fastapi.middleware.cors import CORSMiddleware
-import requests
+import aiohttp
+import asyncio
 import os
+import hashlib
+from collections import deque
+from contextlib import asynccontextmanager
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
 from typing import Optional, List, Dict
 from dotenv import load_dotenv
-import shap
 
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI()
+# Shared HTTP session for outbound API calls (created on startup)
+HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared HTTP session and start batching on startup, clean up on shutdown"""
+    global HTTP_SESSION
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    HTTP_SESSION = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=5)
+    )
+    PREDICTION_BATCHER.start()
+    SAFE_BROWSING_BATCHER.start()
+    yield
+    await SAFE_BROWSING_BATCHER.stop()
+    await PREDICTION_BATCHER.stop()
+    await HTTP_SESSION.close()
+    HTTP_SESSION = None
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # This allows your React frontend to communicate with this server
 app.add_middleware(
@@ -25,13 +55,28 @@ app.add_middleware(
 # Google Safe Browsing API configuration
 GOOGLE_SAFE_BROWSING_API_KEY = os.getenv("GOOGLE_SAFE_BROWSING_API_KEY", "YOUR_API_KEY_HERE")
 SAFE_BROWSING_URL = "https://safebrowsing.googleapis.com/v4/threatMatches:find"
+SAFE_BROWSING_MAX_ATTEMPTS = 3
+SAFE_BROWSING_BACKOFF_SECONDS = 0.2  # Doubled after every failed attempt
+
+# Concurrent lookups are sent together; the API accepts up to 500 URLs per request
+SAFE_BROWSING_MAX_BATCH = 500
+SAFE_BROWSING_MAX_WAIT_MS = 5
+
+# Redis result cache configuration (caching is disabled if REDIS_URL is not set)
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = 3600  # Keep short so Safe Browsing verdicts stay fresh
+REDIS = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+
+# In-process result cache in front of Redis (per worker, avoids the Redis round-trip)
+LOCAL_CACHE_SIZE = 10000
+LOCAL_CACHE_TTL_SECONDS = 600
+LOCAL_CACHE = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL_SECONDS)
 
 # Load the trained XGBoost model
 # Get the directory where this app.py is located
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(APP_DIR, "phishing_model.json")
 MODEL = None
-EXPLAINER = None
 
 # Feature names for explainability
 FEATURE_NAMES = [
@@ -51,59 +96,278 @@ FEATURE_DESCRIPTIONS = {
     "HTTPS Usage": "Legitimate sites typically use HTTPS for security"
 }
 
+# (name, description) per model feature index, for building explanations
+FEATURE_INFO = tuple((name, FEATURE_DESCRIPTIONS.get(name, "")) for name in FEATURE_NAMES)
+
+# Number of most influential features returned in explanations
+MAX_EXPLANATIONS = 3
+
 def load_model():
-    """Load the trained XGBoost model and create SHAP explainer"""
-    global MODEL, EXPLAINER
+    """Load the trained XGBoost model"""
+    global MODEL
     try:
         if os.path.exists(MODEL_PATH):
             MODEL = xgb.Booster(model_file=MODEL_PATH)
             print(f"✓ Trained XGBoost model loaded from {MODEL_PATH}")
-            
-            # Initialize SHAP explainer (using TreeExplainer for XGBoost)
-            try:
-                EXPLAINER = shap.TreeExplainer(MODEL)
-                print(f"✓ SHAP Explainer initialized successfully")
-            except Exception as e:
-                print(f"⚠ Warning: Could not initialize SHAP Explainer: {str(e)}")
-                EXPLAINER = None
         else:
             print(f"⚠ Warning: Model file '{MODEL_PATH}' not found. Please run train_model.py first.")
             print("  Using fallback analysis for now.")
             MODEL = None
-            EXPLAINER = None
     except Exception as e:
         print(f"✗ Error loading model: {str(e)}")
         print("  Using fallback analysis for now.")
         MODEL = None
-        EXPLAINER = None
 
-# Load model on startup
+# Load model on startup. This runs at import time so that with `gunicorn --preload`
+# the model is loaded once in the master and shared copy-on-write by the forked
+# workers. Avoid calling MODEL.predict here: XGBoost's OpenMP thread pool is not
+# safe to start before forking.
 load_model()
 
 
+# Micro-batching configuration for model inference
+MAX_BATCH = 64
+MAX_WAIT_MS = 3
+
+
+class MicroBatcher:
+    """
+    Coalesces items submitted by concurrent requests into batches
+    process_batch receives a list of items and must return one result per item
+    With concurrent=True each batch is processed in its own task, so the next batch
+    can be collected while an I/O-bound call is still in flight
+    """
+
+    def __init__(self, process_batch, max_batch: int, max_wait_ms: float, concurrent: bool = False):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.concurrent = concurrent
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.batch_tasks = set()
+
+    def start(self):
+        """Start the background worker (must be called from the running event loop)"""
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background worker and any batches still in flight"""
+        tasks = list(self.batch_tasks)
+        if self.task is not None:
+            tasks.append(self.task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.batch_tasks.clear()
+        self.task = None
+
+    async def submit(self, item):
+        """Queue an item and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            
+            # Give other requests a short window to join this batch
+            if self.queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            if self.concurrent:
+                # Keep a reference so the task isn't garbage collected while running
+                task = asyncio.create_task(self._process(batch))
+                self.batch_tasks.add(task)
+                task.add_done_callback(self.batch_tasks.discard)
+            else:
+                await self._process(batch)
+
+    async def _process(self, batch):
+        """Run process_batch and resolve each submitter's future"""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def predict_batch(features_batch: List[List[int]]) -> np.ndarray:
+    """
+    Run one XGBoost call for a batch of feature vectors
+    Returns one row per input: per-feature SHAP values followed by the bias term
+    """
+    dmatrix = xgb.DMatrix(np.array(features_batch, dtype=np.float32))
+    return MODEL.predict(dmatrix, pred_contribs=True)
+
+
+PREDICTION_BATCHER = MicroBatcher(predict_batch, MAX_BATCH, MAX_WAIT_MS)
+
+
 class URLData(BaseModel):
     url: str
 
 
-def extract_features(url):
-    # ML models need numbers. This converts the URL into data points.
-    return [
-        len(url),                   # URL length
-        url.count('.'),             # Number of dots
-        url.count('-'),             # Number of hyphens
-        1 if "@" in url else 0,     # Presence of @ symbol
-        1 if "https" in url else 0  # Presence of HTTPS
-    ]
+# Known phishing keywords (matched case-insensitively)
+PHISHING_KEYWORDS = ['login', 'verify', 'account', 'banking', 'paypal', 'update', 'confirm']
 
 
-async def check_google_safe_browsing(url: str) -> Optional[dict]:
+def _build_keyword_automaton(keywords):
     """
-    Check URL using Google Safe Browsing API
-    Returns threat information if found, None if safe
+    Build an Aho-Corasick automaton for the keywords as a dense DFA
+    Returns a (states x 256) transition table and a per-state bitmask of matched keywords
     """
-    if GOOGLE_SAFE_BROWSING_API_KEY == "YOUR_API_KEY_HERE":
-        return None
+    goto = [{}]
+    outputs = [0]
+    for i, keyword in enumerate(keywords):
+        state = 0
+        for byte in keyword.encode("ascii"):
+            if byte not in goto[state]:
+                goto.append({})
+                outputs.append(0)
+                goto[state][byte] = len(goto) - 1
+            state = goto[state][byte]
+        outputs[state] |= 1 << i
+    
+    # Fill in failure transitions breadth-first so every state has an edge for every byte
+    transitions = np.zeros((len(goto), 256), dtype=np.int32)
+    fail = [0] * len(goto)
+    queue = deque()
+    for byte, state in goto[0].items():
+        transitions[0, byte] = state
+        queue.append(state)
+    while queue:
+        current = queue.popleft()
+        for byte in range(256):
+            if byte in goto[current]:
+                state = goto[current][byte]
+                fail[state] = transitions[fail[current], byte]
+                outputs[state] |= outputs[fail[state]]
+                transitions[current, byte] = state
+                queue.append(state)
+            else:
+                transitions[current, byte] = transitions[fail[current], byte]
     
+    return transitions, np.array(outputs, dtype=np.int64)
+
+
+KEYWORD_TRANSITIONS, KEYWORD_OUTPUTS = _build_keyword_automaton(PHISHING_KEYWORDS)
+HTTPS_BYTES = np.frombuffer(b"https", dtype=np.uint8)
+
+
+@njit(cache=True)
+def _scan(buf, transitions, outputs):
+    """
+    Single pass over the UTF-8 bytes of a URL
+    Returns (length, dots, hyphens, has_at, has_https, keyword_count)
+    """
+    length = 0
+    dots = 0
+    hyphens = 0
+    has_at = 0
+    has_https = 0
+    https_matched = 0  # Length of the current partial match of "https"
+    state = 0
+    keyword_mask = 0
+    
+    for i in range(buf.shape[0]):
+        b = buf[i]
+        
+        # Count characters, not bytes (skip UTF-8 continuation bytes)
+        if (b & 0xC0) != 0x80:
+            length += 1
+        
+        if b == 46:  # '.'
+            dots += 1
+        elif b == 45:  # '-'
+            hyphens += 1
+        elif b == 64:  # '@'
+            has_at = 1
+        
+        # Case-sensitive match of "https" (the pattern has no repeated prefix)
+        if b == HTTPS_BYTES[https_matched]:
+            https_matched += 1
+            if https_matched == 5:
+                has_https = 1
+                https_matched = 0
+        elif b == 104:  # 'h'
+            https_matched = 1
+        else:
+            https_matched = 0
+        
+        # Case-insensitive keyword matching: lowercase ASCII letters on the fly
+        if 65 <= b <= 90:
+            b += 32
+        state = transitions[state, b]
+        keyword_mask |= outputs[state]
+    
+    keyword_count = 0
+    while keyword_mask:
+        keyword_count += keyword_mask & 1
+        keyword_mask >>= 1
+    
+    return length, dots, hyphens, has_at, has_https, keyword_count
+
+
+def scan_url(url: str):
+    """Run the compiled single-pass scanner over a URL string"""
+    buf = np.frombuffer(url.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+    return _scan(buf, KEYWORD_TRANSITIONS, KEYWORD_OUTPUTS)
+
+
+def extract_features(url):
+    # ML models need numbers. This converts the URL into data points:
+    # URL length, number of dots, number of hyphens, presence of @ symbol, presence of HTTPS
+    return list(scan_url(url)[:5])
+
+
+# Compile the scanner at import so the first request doesn't pay the JIT cost
+scan_url("https://warmup.example.com/login")
+
+
+async def post_safe_browsing(payload: dict) -> Optional[dict]:
+    """
+    POST a lookup to the Google Safe Browsing API over the shared keep-alive session
+    Retries connection errors, rate limiting and server errors with exponential backoff
+    Returns the decoded response body, or None if the API did not answer with 200
+    """
+    delay = SAFE_BROWSING_BACKOFF_SECONDS
+    for attempt in range(1, SAFE_BROWSING_MAX_ATTEMPTS + 1):
+        try:
+            async with HTTP_SESSION.post(
+                SAFE_BROWSING_URL,
+                params={"key": GOOGLE_SAFE_BROWSING_API_KEY},
+                json=payload
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                if response.status != 429 and response.status < 500:
+                    return None
+        except aiohttp.ClientConnectionError:
+            if attempt == SAFE_BROWSING_MAX_ATTEMPTS:
+                raise
+        if attempt < SAFE_BROWSING_MAX_ATTEMPTS:
+            await asyncio.sleep(delay)
+            delay *= 2
+    return None
+
+
+async def check_google_safe_browsing_batch(urls: List[str]) -> List[Optional[dict]]:
+    """
+    Check several URLs with a single Google Safe Browsing API request
+    Returns one result per URL: threat information if found, {"safe": True} if not,
+    None if the lookup failed
+    """
     try:
         payload = {
             "client": {
@@ -115,93 +379,163 @@ async def check_google_safe_browsing(url: str) -> Optional[dict]:
                 "platformTypes": ["ANY_PLATFORM"],
                 "threatEntryTypes": ["URL"],
                 "threatEntries": [
-                    {"url": url}
+                    {"url": url} for url in dict.fromkeys(urls)
                 ]
             }
         }
         
-        response = requests.post(
-            f"{SAFE_BROWSING_URL}?key={GOOGLE_SAFE_BROWSING_API_KEY}",
-            json=payload,
-            timeout=5
-        )
+        data = await post_safe_browsing(payload)
+        if data is None:
+            # The API never answered with 200 (even after retries), so there is no verdict
+            print("Google Safe Browsing error: lookup failed")
+            return [None] * len(urls)
         
-        if response.status_code == 200:
-            data = response.json()
-            if "matches" in data and data["matches"]:
-                return {
-                    "threats": data["matches"],
-                    "safe": False
-                }
-        return {"safe": True}
+        # Map each match back to the URL it was reported for (an empty body means no matches)
+        threats_by_url = {}
+        if "matches" in data:
+            for match in data["matches"]:
+                threats_by_url.setdefault(match["threat"]["url"], []).append(match)
+        
+        return [
+            {"threats": threats_by_url[url], "safe": False} if url in threats_by_url else {"safe": True}
+            for url in urls
+        ]
     except Exception as e:
         print(f"Google Safe Browsing error: {str(e)}")
+        return [None] * len(urls)
+
+
+SAFE_BROWSING_BATCHER = MicroBatcher(
+    check_google_safe_browsing_batch,
+    SAFE_BROWSING_MAX_BATCH,
+    SAFE_BROWSING_MAX_WAIT_MS,
+    concurrent=True  # Don't hold up new lookups while a POST is in flight
+)
+
+
+async def check_google_safe_browsing(url: str) -> Optional[dict]:
+    """
+    Check URL using Google Safe Browsing API
+    Returns threat information if found, None if safe
+    Lookups from concurrent requests are batched into one API call
+    """
+    if GOOGLE_SAFE_BROWSING_API_KEY == "YOUR_API_KEY_HERE" or HTTP_SESSION is None:
         return None
+    
+    return await SAFE_BROWSING_BATCHER.submit(url)
 
 
-def get_feature_explanations(features_array: np.ndarray, prediction: float) -> List[Dict]:
+def get_feature_explanations(shap_values: np.ndarray, features: List[int]) -> List[Dict]:
     """
     Generate SHAP-based explanations for the model prediction
-    Shows which features contributed to the decision
+    Shows which features contributed most to the decision (top MAX_EXPLANATIONS)
+    shap_values holds one contribution per feature, as returned by
+    Booster.predict(..., pred_contribs=True) without the trailing bias column
     """
-    explanations = []
-    
-    if EXPLAINER is None:
-        return explanations
-    
     try:
-        # Get SHAP values for this prediction
-        dmatrix = xgb.DMatrix(features_array)
-        shap_values = EXPLAINER.shap_values(dmatrix)
+        # Most important first (by absolute SHAP value); stable so ties keep feature order
+        top_features = np.argsort(-np.abs(shap_values), kind="stable")[:MAX_EXPLANATIONS]
         
-        # Get the base value (model's average prediction)
-        base_value = EXPLAINER.expected_value
-        
-        # Create explanation for each feature
-        for i, feature_name in enumerate(FEATURE_NAMES):
-            shap_value = float(shap_values[0][i])
-            feature_value = float(features_array[0][i])
+        explanations = []
+        for i in top_features:
+            feature_name, description = FEATURE_INFO[i]
+            
+            # Features are small integer counts/flags and 4 decimals is plenty for
+            # SHAP values, which keeps the JSON payload compact
+            # (direction comes from the unrounded value so tiny contributions keep their sign)
+            pushes_phishing = shap_values[i] > 0
+            shap_value = round(float(shap_values[i]), 4) + 0.0  # + 0.0 turns -0.0 into 0.0
+            feature_value = int(features[i])
             
             # Determine if feature pushed prediction towards phishing or safe
-            contribution = "increases" if shap_value > 0 else "decreases"
-            phishing_risk_text = "phishing risk" if shap_value > 0 else "safety confidence"
+            contribution = "increases" if pushes_phishing else "decreases"
+            phishing_risk_text = "phishing risk" if pushes_phishing else "safety confidence"
             
             explanations.append({
                 "feature": feature_name,
                 "value": feature_value,
                 "shap_value": shap_value,
                 "impact": abs(shap_value),
-                "direction": "phishing" if shap_value > 0 else "safe",
-                "description": FEATURE_DESCRIPTIONS.get(feature_name, ""),
-                "explanation": f"{feature_name} (value: {feature_value:.1f}) {contribution} {phishing_risk_text}"
+                "direction": "phishing" if pushes_phishing else "safe",
+                "description": description,
+                "explanation": f"{feature_name} (value: {feature_value}) {contribution} {phishing_risk_text}"
             })
         
-        # Sort by absolute SHAP value (most important first)
-        explanations.sort(key=lambda x: x["impact"], reverse=True)
-        
         return explanations
     except Exception as e:
         print(f"Error generating SHAP explanations: {str(e)}")
         return []
 
 
+def result_cache_key(url: str) -> bytes:
+    """Fixed-size cache key for a URL (16-byte BLAKE2b digest, so long URLs don't bloat the caches)"""
+    return b"pg:" + hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+async def get_cached_result(key: bytes) -> Optional[bytes]:
+    """
+    Return a previously computed /analyze response as JSON bytes, or None on miss/outage
+    Checks the in-process cache first, then Redis
+    """
+    cached = LOCAL_CACHE.get(key)
+    if cached is not None or REDIS is None:
+        return cached
+    
+    try:
+        async with REDIS.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.ttl(key)
+            cached, ttl = await pipe.execute()
+        
+        # Only copy into the in-process cache if the Redis entry outlives it, so a
+        # result is never served for longer than CACHE_TTL_SECONDS in total
+        if cached is not None and ttl >= LOCAL_CACHE_TTL_SECONDS:
+            LOCAL_CACHE[key] = cached
+        return cached
+    except Exception as e:
+        print(f"Redis cache read error: {str(e)}")
+    return None
+
+
+async def set_cached_result(key: bytes, body: bytes):
+    """Store a serialized /analyze response in the in-process cache and Redis, ignoring outages"""
+    LOCAL_CACHE[key] = body
+    if REDIS is None:
+        return
+    
+    try:
+        await REDIS.set(key, body, ex=CACHE_TTL_SECONDS)
+    except Exception as e:
+        print(f"Redis cache write error: {str(e)}")
+
+
 @app.post("/analyze")
 async def analyze_url(data: URLData):
 
-    # 1. Convert URL to features
+    # 0. Return the cached result if this URL was analyzed recently
+    cache_key = result_cache_key(data.url)
+    cached_result = await get_cached_result(cache_key)
+    if cached_result is not None:
+        # Already serialized, so skip decoding and re-encoding
+        return Response(content=cached_result, media_type="application/json")
+
+    # 1. Start the Google Safe Browsing check so it overlaps with model inference
+    google_task = asyncio.create_task(check_google_safe_browsing(data.url))
+
+    # 2. Convert URL to features
     features = extract_features(data.url)
-    features_array = np.array([features], dtype=np.float32)
     
-    # 2. Get prediction from trained XGBoost model or use fallback
+    # 3. Get prediction from trained XGBoost model or use fallback
     explanations = []
+    model_succeeded = False
     if MODEL is not None:
         try:
-            # Create DMatrix for XGBoost prediction
-            dmatrix = xgb.DMatrix(features_array)
-            prediction = MODEL.predict(dmatrix)
+            # A single (batched) tree traversal gives per-feature SHAP values plus the bias
+            # term; their sum is the raw margin, so the probability comes from the same call
+            contribs = await PREDICTION_BATCHER.submit(features)
             
-            # XGBoost returns probability for class 1 (phishing)
-            phishing_probability = float(prediction[0])
+            # Sigmoid of the margin is the probability for class 1 (phishing)
+            phishing_probability = float(1.0 / (1.0 + np.exp(-contribs.sum())))
             
             # Convert probability to risk score (0-100)
             risk_score = int(phishing_probability * 100)
@@ -209,7 +543,8 @@ async def analyze_url(data: URLData):
             model_source = "Trained XGBoost Model"
             
             # Get SHAP explanations for why this decision was made
-            explanations = get_feature_explanations(features_array, phishing_probability)
+            explanations = get_feature_explanations(contribs[:len(FEATURE_NAMES)], features)
+            model_succeeded = True
             
         except Exception as e:
             print(f"Model prediction error: {str(e)}")
@@ -221,8 +556,8 @@ async def analyze_url(data: URLData):
         risk_score, is_safe = _get_fallback_risk_score(data.url)
         model_source = "Fallback Logic (Model not loaded)"
 
-    # 3. Check Google Safe Browsing API
-    google_result = await check_google_safe_browsing(data.url)
+    # 4. Collect the Google Safe Browsing result
+    google_result = await google_task
     google_safe = True
     google_threat = None
     
@@ -233,7 +568,7 @@ async def analyze_url(data: URLData):
             risk_score = 95  # Critical risk if Google flags it
             is_safe = False
 
-    return {
+    result = {
         "isSafe": is_safe,
         "riskScore": int(min(risk_score, 100)),
         "message": f"Analyzed using {model_source} and Google Safe Browsing API",
@@ -248,49 +583,70 @@ async def analyze_url(data: URLData):
             "googleSafeBrowsing": {
                 "safe": google_safe,
                 "threats": google_threat,
-                "message": "Google Safe Browsing check completed" if google_result else "Google Safe Browsing API key not configured"
+                "message": (
+                    "Google Safe Browsing check completed" if google_result
+                    else "Google Safe Browsing API key not configured" if GOOGLE_SAFE_BROWSING_API_KEY == "YOUR_API_KEY_HERE"
+                    else "Google Safe Browsing check failed"
+                )
             }
         }
     }
 
+    # Serialize once for both the caches and the response
+    body = orjson.dumps(result)
+    
+    # Only cache complete verdicts: a fallback score or a failed Safe Browsing lookup
+    # must not be served for the next hour (a skipped lookup without an API key is fine)
+    google_checked = google_result is not None or GOOGLE_SAFE_BROWSING_API_KEY == "YOUR_API_KEY_HERE"
+    if model_succeeded and google_checked:
+        await set_cached_result(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
 
 def _get_fallback_risk_score(url: str):
     """
     Fallback risk scoring when model is not available
     This uses pattern-based heuristics similar to the original logic
     """
+    length, dot_count, hyphen_count, has_at, has_https, keyword_count = scan_url(url)
     risk_score = 0
     
     # URL length analysis (typical phishing URLs are longer)
-    if len(url) > 75:
+    if length > 75:
         risk_score += 20
-    elif len(url) > 54:
+    elif length > 54:
         risk_score += 10
     
     # Number of dots (more dots = more suspicious)
-    dot_count = url.count('.')
     if dot_count > 4:
         risk_score += 25
     elif dot_count > 2:
         risk_score += 10
     
     # Hyphen count
-    if url.count('-') > 4:
+    if hyphen_count > 4:
         risk_score += 15
     
     # @ symbol (used to hide real domain)
-    if "@" in url:
+    if has_at:
         risk_score += 30
     
     # HTTPS presence (legitimate sites usually have HTTPS)
-    if "https" not in url:
+    if not has_https:
         risk_score += 15
     
     # Known phishing keywords
-    keywords = ['login', 'verify', 'account', 'banking', 'paypal', 'update', 'confirm']
-    keyword_count = sum(1 for k in keywords if k in url.lower())
     if keyword_count > 0:
         risk_score += (keyword_count * 10)
     
     is_safe = risk_score < 45
     return risk_score, is_safe
+
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # "auto" uses uvloop and httptools when installed (uvloop is not available on
+    # Windows) and falls back to asyncio / h11 otherwise. gunicorn's UvicornWorker
+    # (see Procfile) makes the same choice.
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")), loop="auto", http="auto")
@@ -3,109 +3,138 @@ Generate synthetic phishing dataset for training
 This creates a CSV file with URL features and labels (0 = safe, 1 = phishing)
 """
 
+import numpy as np
 import pandas as pd
-import random
-import os
 
 # Define parameters
 NUM_SAFE_URLS = 500
 NUM_PHISHING_URLS = 500
+RANDOM_SEED = 42
 
-def extract_url_features(url):
-    """Extract features from a URL"""
+FEATURE_COLUMNS = ['url_length', 'dots', 'hyphens', 'has_at_symbol', 'has_https']
+
+SAFE_DOMAINS = [
+    'google.com', 'facebook.com', 'twitter.com', 'github.com', 'stackoverflow.com',
+    'wikipedia.org', 'amazon.com', 'microsoft.com', 'apple.com', 'youtube.com',
+    'linkedin.com', 'instagram.com', 'reddit.com', 'slack.com', 'notion.so',
+    'figma.com', 'stripe.com', 'shopify.com', 'zendesk.com', 'mailchimp.com'
+]
+
+SAFE_PATHS = [
+    '', '/products', '/services', '/about', '/contact',
+    '/pricing', '/blog', '/docs', '/api', '/dashboard',
+    '/settings', '/profile', '/account', '/help', '/support'
+]
+
+PHISHING_DOMAINS = [
+    'gogle-secure.com', 'faceb00k-verify.net', 'amaz0n-account.co',
+    'paypal-login.xyz', 'bank-security.tk', 'verify-identity.ml',
+    'confirm-account.ga', 'update-profile.cf', 'secure-banking.gq',
+    'apple-id-verify.tk', 'microsoft-account.ml', 'urgent-action.cf',
+    'suspicious-link.tk', 'fake-domain-123.xyz', 'phishing-example.tk'
+]
+
+PHISHING_PATHS = [
+    '/login', '/verify', '/account', '/banking', '/paypal',
+    '/secure', '/update', '/confirm', '/action', '/urgent',
+    '/verify-account', '/login-secure', '/confirm-identity'
+]
+
+PHISHING_QUERY = "?verify=user&confirm=payment&update=true"
+
+
+def component_features(parts):
+    """
+    Count features for each URL component (scheme, domain, path, ...)
+    URL features are then sums (or ORs) of component features, so URLs never
+    have to be built as strings. Matches spanning two components are ignored.
+    """
     return {
-        'url_length': len(url),
-        'dots': url.count('.'),
-        'hyphens': url.count('-'),
-        'has_at_symbol': 1 if '@' in url else 0,
-        'has_https': 1 if 'https' in url else 0,
+        'url_length': np.array([len(p) for p in parts]),
+        'dots': np.array([p.count('.') for p in parts]),
+        'hyphens': np.array([p.count('-') for p in parts]),
+        'has_at_symbol': np.array([1 if '@' in p else 0 for p in parts]),
+        'has_https': np.array([1 if 'https' in p else 0 for p in parts]),
     }
 
-def generate_safe_urls(count):
-    """Generate safe URL examples"""
-    domains = [
-        'google.com', 'facebook.com', 'twitter.com', 'github.com', 'stackoverflow.com',
-        'wikipedia.org', 'amazon.com', 'microsoft.com', 'apple.com', 'youtube.com',
-        'linkedin.com', 'instagram.com', 'reddit.com', 'slack.com', 'notion.so',
-        'figma.com', 'stripe.com', 'shopify.com', 'zendesk.com', 'mailchimp.com'
-    ]
-    
-    paths = [
-        '', '/products', '/services', '/about', '/contact',
-        '/pricing', '/blog', '/docs', '/api', '/dashboard',
-        '/settings', '/profile', '/account', '/help', '/support'
-    ]
-    
-    safe_urls = []
-    for _ in range(count):
-        domain = random.choice(domains)
-        path = random.choice(paths)
-        url = f"https://{domain}{path}"
-        features = extract_url_features(url)
-        features['label'] = 0  # Safe URL
-        safe_urls.append(features)
-    
-    return safe_urls
-
-def generate_phishing_urls(count):
-    """Generate phishing URL examples"""
-    fake_domains = [
-        'gogle-secure.com', 'faceb00k-verify.net', 'amaz0n-account.co',
-        'paypal-login.xyz', 'bank-security.tk', 'verify-identity.ml',
-        'confirm-account.ga', 'update-profile.cf', 'secure-banking.gq',
-        'apple-id-verify.tk', 'microsoft-account.ml', 'urgent-action.cf',
-        'suspicious-link.tk', 'fake-domain-123.xyz', 'phishing-example.tk'
-    ]
-    
-    phishing_paths = [
-        '/login', '/verify', '/account', '/banking', '/paypal',
-        '/secure', '/update', '/confirm', '/action', '/urgent',
-        '/verify-account', '/login-secure', '/confirm-identity'
-    ]
-    
-    phishing_urls = []
-    for _ in range(count):
-        domain = random.choice(fake_domains)
-        path = random.choice(phishing_paths)
-        
-        # Add suspicious elements
-        url = f"http://{domain}{path}"  # HTTP (not HTTPS)
-        
-        # Sometimes add extra dots
-        if random.random() > 0.5:
-            url = url + "?verify=user&confirm=payment&update=true"
-        
-        # Sometimes add hyphens and special chars
-        if random.random() > 0.6:
-            url = url.replace('-', '-' + str(random.randint(0, 9)))
-        
-        features = extract_url_features(url)
-        features['label'] = 1  # Phishing URL
-        phishing_urls.append(features)
-    
-    return phishing_urls
+
+def combine_features(*components):
+    """Combine (features, index) pairs of URL components into URL feature columns"""
+    features = {}
+    for column in FEATURE_COLUMNS:
+        values = [component[column][index] for component, index in components]
+        if column in ('has_at_symbol', 'has_https'):
+            features[column] = np.bitwise_or.reduce(values)
+        else:
+            features[column] = np.sum(values, axis=0)
+    return features
+
+
+def generate_safe_urls(count, rng):
+    """Generate feature columns for safe URL examples (https://{domain}{path})"""
+    scheme = component_features(['https://'])
+    domains = component_features(SAFE_DOMAINS)
+    paths = component_features(SAFE_PATHS)
+
+    features = combine_features(
+        (scheme, np.zeros(count, dtype=int)),
+        (domains, rng.integers(0, len(SAFE_DOMAINS), size=count)),
+        (paths, rng.integers(0, len(SAFE_PATHS), size=count)),
+    )
+    features['label'] = np.zeros(count, dtype=int)  # Safe URL
+    return features
+
+
+def generate_phishing_urls(count, rng):
+    """Generate feature columns for phishing URL examples (http://{domain}{path}[?query])"""
+    scheme = component_features(['http://'])  # HTTP (not HTTPS)
+    domains = component_features(PHISHING_DOMAINS)
+    paths = component_features(PHISHING_PATHS)
+    query = component_features(['', PHISHING_QUERY])
+
+    # Sometimes add extra query parameters
+    add_query = (rng.random(count) > 0.5).astype(int)
+
+    features = combine_features(
+        (scheme, np.zeros(count, dtype=int)),
+        (domains, rng.integers(0, len(PHISHING_DOMAINS), size=count)),
+        (paths, rng.integers(0, len(PHISHING_PATHS), size=count)),
+        (query, add_query),
+    )
+
+    # Sometimes follow every hyphen with a random digit, adding one character per hyphen
+    add_digits = rng.random(count) > 0.6
+    features['url_length'] = features['url_length'] + add_digits * features['hyphens']
+
+    features['label'] = np.ones(count, dtype=int)  # Phishing URL
+    return features
+
 
 def main():
     print("🔄 Generating synthetic phishing dataset...")
-    
+    rng = np.random.default_rng(RANDOM_SEED)
+
     # Generate datasets
     print(f"  • Generating {NUM_SAFE_URLS} safe URLs...")
-    safe_urls = generate_safe_urls(NUM_SAFE_URLS)
-    
+    safe_urls = generate_safe_urls(NUM_SAFE_URLS, rng)
+
     print(f"  • Generating {NUM_PHISHING_URLS} phishing URLs...")
-    phishing_urls = generate_phishing_urls(NUM_PHISHING_URLS)
-    
+    phishing_urls = generate_phishing_urls(NUM_PHISHING_URLS, rng)
+
     # Combine and shuffle
-    all_data = safe_urls + phishing_urls
-    random.shuffle(all_data)
-    
+    order = rng.permutation(NUM_SAFE_URLS + NUM_PHISHING_URLS)
+    all_data = {
+        column: np.concatenate([safe_urls[column], phishing_urls[column]])[order]
+        for column in FEATURE_COLUMNS + ['label']
+    }
+
     # Create DataFrame
     df = pd.DataFrame(all_data)
-    
+
     # Save to CSV
     output_file = 'phishing_dataset.csv'
     df.to_csv(output_file, index=False)
-    
+
     print(f"\n✓ Dataset created successfully!")
     print(f"  • File: {output_file}")
     print(f"  • Total samples: {len(df)}")
@@ -0,0 +1,78 @@
+"""
+Tests for the /analyze Safe Browsing handling
+Run with: python -m unittest test_app
+"""
+
+import unittest
+
+import orjson
+from aiohttp import web
+
+import app
+
+
+class SafeBrowsingFailureTest(unittest.IsolatedAsyncioTestCase):
+    """A failed Safe Browsing lookup must not be reported as safe or cached"""
+
+    async def asyncSetUp(self):
+        self.calls = 0
+        self.status = 503
+
+        async def handler(request):
+            self.calls += 1
+            if self.status != 200:
+                return web.Response(status=self.status)
+            return web.json_response({})
+
+        server = web.Application()
+        server.router.add_post("/find", handler)
+        self.runner = web.AppRunner(server)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.patched = {
+            "SAFE_BROWSING_URL": f"http://127.0.0.1:{port}/find",
+            "GOOGLE_SAFE_BROWSING_API_KEY": "test-key",
+            "SAFE_BROWSING_BACKOFF_SECONDS": 0,
+            "REDIS": None,
+        }
+        self.original = {name: getattr(app, name) for name in self.patched}
+        for name, value in self.patched.items():
+            setattr(app, name, value)
+        app.LOCAL_CACHE.clear()
+
+    async def asyncTearDown(self):
+        for name, value in self.original.items():
+            setattr(app, name, value)
+        app.LOCAL_CACHE.clear()
+        await self.runner.cleanup()
+
+    async def analyze(self, url):
+        async with app.lifespan(app.app):
+            response = await app.analyze_url(app.URLData(url=url))
+        return orjson.loads(response.body)
+
+    async def test_server_error_is_not_cached(self):
+        result = await self.analyze("http://paypal-login.xyz/verify")
+
+        self.assertEqual(self.calls, app.SAFE_BROWSING_MAX_ATTEMPTS)
+        google = result["checks"]["googleSafeBrowsing"]
+        self.assertEqual(google["message"], "Google Safe Browsing check failed")
+        self.assertIsNone(google["threats"])
+        self.assertEqual(len(app.LOCAL_CACHE), 0)
+
+    async def test_completed_lookup_is_cached(self):
+        self.status = 200
+        result = await self.analyze("https://github.com")
+
+        self.assertEqual(self.calls, 1)
+        google = result["checks"]["googleSafeBrowsing"]
+        self.assertTrue(google["safe"])
+        self.assertEqual(google["message"], "Google Safe Browsing check completed")
+        self.assertEqual(len(app.LOCAL_CACHE), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()